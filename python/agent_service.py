@@ -3,11 +3,21 @@ gRPC server for Petoncle AI agent service
 """
 import os
 import sys
+import asyncio
 import logging
 from concurrent import futures
 import grpc
 from dotenv import load_dotenv
 
+try:
+    import uvloop  # Faster event loop, not available on Windows
+except ImportError:
+    uvloop = None
+
+# Use the upb (C) protobuf backend unless told otherwise; must be set
+# before any generated module is imported
+os.environ.setdefault("PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION", "upb")
+
 # Add proto directory to path for generated modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'proto'))
 
@@ -16,7 +26,8 @@ import chat_pb2
 import chat_pb2_grpc
 
 from agents import ChatAgent
-from agents.graph import MultiAgentSystem
+from agents.graph import get_system
+from agents._cache import cache_enabled
 
 # Configure logging
 logging.basicConfig(
@@ -26,6 +37,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Agents read at most the last 10 commands of context (ChatAgent 5, Scribe 10)
+MAX_CONTEXT_COMMANDS = 10
+
+# Fixed error responses, built once and shared (never mutated)
+EMPTY_MESSAGE_ERROR = chat_pb2.ChatResponse(message="⚠️ Message cannot be empty", agent="error")
+MESSAGE_TOO_LONG_ERROR = chat_pb2.ChatResponse(message="⚠️ Message too long (max 10000 characters)", agent="error")
+INVALID_CHARACTERS_ERROR = chat_pb2.ChatResponse(message="⚠️ Message contains invalid characters", agent="error")
+
+# gRPC server tuning: bigger HTTP/2 writes and frames, many concurrent
+# streams per connection, and keepalive to detect dead clients
+SERVER_OPTIONS = [
+    ("grpc.http2.write_buffer_size", 1 << 20),
+    ("grpc.http2.max_frame_size", (1 << 24) - 1),  # HTTP/2 maximum
+    ("grpc.max_concurrent_streams", 1000),
+    ("grpc.so_reuseport", 1),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.optimization_target", "throughput"),
+]
+
 
 class ChatServiceServicer(chat_pb2_grpc.ChatServiceServicer):
     """Implementation of ChatService gRPC service"""
@@ -33,10 +64,61 @@ class ChatServiceServicer(chat_pb2_grpc.ChatServiceServicer):
     def __init__(self):
         """Initialize the service with multi-agent system"""
         load_dotenv()
-        self.agent_system = MultiAgentSystem()
+        self.agent_system = get_system()
+        # (message, context) of the previous request and its result, replayed
+        # when the exact same request comes in again with the cache enabled.
+        # Only stateless specialists are remembered: the general agent keeps
+        # a conversation history, so a repeated message is a new turn there.
+        self._last_exchange = None
         logger.info("Multi-agent system initialized (Orchestrator + 4 specialists)")
 
-    def SendMessage(self, request, context):
+    def _validate(self, request, context):
+        """
+        Validate and sanitize an incoming request
+
+        Args:
+            request: ChatRequest with message and optional context
+            context: gRPC context
+
+        Returns:
+            (sanitized_message, None) if valid, else (None, error ChatResponse)
+        """
+        if not request.message:
+            logger.warning("Received empty message")
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("Message cannot be empty")
+            return None, EMPTY_MESSAGE_ERROR
+
+        if len(request.message) > 10000:  # 10K char limit
+            logger.warning("Message too long: %d chars", len(request.message))
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("Message too long (max 10000 characters)")
+            return None, MESSAGE_TOO_LONG_ERROR
+
+        # Sanitize message (remove null bytes, excessive whitespace), skipping
+        # the copies in the common case where there is nothing to remove
+        message = request.message
+        if '\x00' in message or message[:1].isspace() or message[-1:].isspace():
+            sanitized_message = message.replace('\x00', '').strip()
+        else:
+            sanitized_message = message
+        if not sanitized_message:
+            logger.warning("Message became empty after sanitization")
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details("Message contains invalid characters")
+            return None, INVALID_CHARACTERS_ERROR
+
+        return sanitized_message, None
+
+    def _command_context(self, request):
+        """
+        Trim the request's context at the boundary, agents only read its tail
+
+        Slicing the repeated field already returns a new list, so no extra copy.
+        """
+        return request.context[-MAX_CONTEXT_COMMANDS:] or None
+
+    async def SendMessage(self, request, context):
         """
         Handle chat message requests
 
@@ -48,40 +130,36 @@ class ChatServiceServicer(chat_pb2_grpc.ChatServiceServicer):
             ChatResponse with AI response
         """
         try:
-            # Validate input
-            if not request.message:
-                logger.warning("Received empty message")
-                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-                context.set_details("Message cannot be empty")
-                return chat_pb2.ChatResponse(message="⚠️ Message cannot be empty", agent="error")
-
-            if len(request.message) > 10000:  # 10K char limit
-                logger.warning(f"Message too long: {len(request.message)} chars")
-                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-                context.set_details("Message too long (max 10000 characters)")
-                return chat_pb2.ChatResponse(message="⚠️ Message too long (max 10000 characters)", agent="error")
-
-            # Sanitize message (remove null bytes, excessive whitespace)
-            sanitized_message = request.message.replace('\x00', '').strip()
-            if not sanitized_message:
-                logger.warning("Message became empty after sanitization")
-                context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-                context.set_details("Message contains invalid characters")
-                return chat_pb2.ChatResponse(message="⚠️ Message contains invalid characters", agent="error")
-
-            logger.info(f"Received message: {sanitized_message[:50]}...")
-
-            # Process through multi-agent system
-            result = self.agent_system.process(
-                message=sanitized_message,
-                context=list(request.context) if request.context else None
-            )
+            sanitized_message, error_response = self._validate(request, context)
+            if error_response is not None:
+                return error_response
+
+            logger.info("Received message: %.50s...", sanitized_message)
+
+            command_context = self._command_context(request)
+
+            # Short-circuit identical consecutive requests
+            request_key = (sanitized_message, tuple(command_context or ()))
+            last_exchange = self._last_exchange
+            if cache_enabled() and last_exchange and last_exchange[0] == request_key:
+                logger.info("Identical to previous request, replaying response")
+                result = last_exchange[1]
+            else:
+                # Process through multi-agent system
+                result = await self.agent_system.aprocess(
+                    message=sanitized_message,
+                    context=command_context
+                )
+                # Routing depends on the message only, so a replayed key always
+                # maps back to the same (stateless) specialist
+                if result["agent"] != "general":
+                    self._last_exchange = (request_key, result)
 
             response_text = result["response"]
             agent_used = result["agent"]
 
-            logger.info(f"Agent used: {agent_used}")
-            logger.info(f"Sending response: {response_text[:50]}...")
+            logger.info("Agent used: %s", agent_used)
+            logger.info("Sending response: %.50s...", response_text)
 
             return chat_pb2.ChatResponse(
                 message=response_text,
@@ -90,43 +168,110 @@ class ChatServiceServicer(chat_pb2_grpc.ChatServiceServicer):
             )
 
         except ValueError as e:
-            logger.error(f"Validation error: {e}")
+            logger.error("Validation error: %s", e)
             context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
             context.set_details(str(e))
             return chat_pb2.ChatResponse(message=f"⚠️ Validation error: {e}", agent="error")
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Error processing message: %s", e)
             context.set_code(grpc.StatusCode.INTERNAL)
             context.set_details(str(e))
             return chat_pb2.ChatResponse(message=f"❌ Error: {e}", agent="error")
 
+    async def StreamMessage(self, request, context):
+        """
+        Handle chat message requests, streaming the response
 
-def serve(port: int = 50051):
+        Args:
+            request: ChatRequest with message and optional context
+            context: gRPC context
+
+        Yields:
+            ChatResponse chunks of the AI response, then an empty terminal one
+        """
+        try:
+            sanitized_message, error_response = self._validate(request, context)
+            if error_response is not None:
+                yield error_response
+                return
+
+            logger.info("Received message (stream): %.50s...", sanitized_message)
+
+            result = self.agent_system.astream(
+                message=sanitized_message,
+                context=self._command_context(request)
+            )
+            agent_used = result["agent"]
+            logger.info("Agent used: %s", agent_used)
+
+            async for chunk in result["chunks"]:
+                yield chat_pb2.ChatResponse(message=chunk, agent=agent_used)
+
+            # Terminal message: marks the end of the response
+            yield chat_pb2.ChatResponse(message="", agent=agent_used)
+
+        except ValueError as e:
+            logger.error("Validation error: %s", e)
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            yield chat_pb2.ChatResponse(message=f"⚠️ Validation error: {e}", agent="error")
+        except Exception as e:
+            logger.error("Error streaming message: %s", e)
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(str(e))
+            yield chat_pb2.ChatResponse(message=f"❌ Error: {e}", agent="error")
+
+
+async def serve(port: int = 50051):
     """
     Start the gRPC server
 
+    Handlers are coroutines on grpc.aio, so requests waiting on Mistral
+    are awaited instead of pinning a worker thread each.
+
     Args:
         port: Port to listen on (default: 50051)
     """
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    chat_pb2_grpc.add_ChatServiceServicer_to_server(
-        ChatServiceServicer(), server
+    # Load .env before reading any setting from the environment
+    load_dotenv()
+
+    # RPCs are coroutines, but sync work offloaded with run_in_executor
+    # (e.g. LangGraph's sync nodes) still goes through the default executor
+    workers = int(os.getenv("PETONCLE_GRPC_WORKERS", max(32, (os.cpu_count() or 1) * 8)))
+    asyncio.get_running_loop().set_default_executor(
+        futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="petoncle")
     )
 
+    servicer = ChatServiceServicer()
+
+    # Warm up the Mistral connection pool so the first RPC doesn't pay for it
+    try:
+        await servicer.agent_system.warmup()
+        logger.info("Mistral connection pool warmed up")
+    except Exception as e:
+        logger.warning("Mistral warmup failed, first request will be slower: %s", e)
+
+    server = grpc.aio.server(options=SERVER_OPTIONS)
+    chat_pb2_grpc.add_ChatServiceServicer_to_server(servicer, server)
+
     server.add_insecure_port(f'[::]:{port}')
-    server.start()
+    await server.start()
 
-    logger.info(f"🚀 Petoncle Agent Service started on port {port}")
+    logger.info("🚀 Petoncle Agent Service started on port %d", port)
     logger.info("Ready to receive chat requests...")
 
     try:
-        server.wait_for_termination()
-    except KeyboardInterrupt:
+        await server.wait_for_termination()
+    finally:
         logger.info("Shutting down server...")
-        server.stop(0)
+        await server.stop(0)
 
 
 if __name__ == '__main__':
     # Get port from env or use default
     port = int(os.getenv('GRPC_PORT', 50051))
-    serve(port)
+    run = uvloop.run if uvloop else asyncio.run
+    try:
+        run(serve(port))
+    except KeyboardInterrupt:
+        pass
@@ -3,5 +3,6 @@ from .orchestrator import Orchestrator
 from .toolsmith import Toolsmith
 from .researcher import Researcher
 from .scribe import Scribe
+from ._client import get_client
 
-__all__ = ["ChatAgent", "Orchestrator", "Toolsmith", "Researcher", "Scribe"]
+__all__ = ["ChatAgent", "Orchestrator", "Toolsmith", "Researcher", "Scribe", "get_client"]
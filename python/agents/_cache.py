@@ -0,0 +1,126 @@
+"""
+Persistent cache for Mistral completions
+
+Enabled with PETONCLE_LLM_CACHE=1. Entries are keyed on a hash of the
+model, max_tokens and full message list (system prompt included), so each
+agent gets its own key space for free.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from functools import wraps
+from typing import AsyncIterator
+
+import diskcache
+
+
+CACHE_DIR = "~/.petoncle/llm_cache"
+CACHE_TTL = 86400  # 24 hours
+
+_cache = None
+_cache_lock = threading.Lock()  # cache I/O runs in asyncio.to_thread workers
+
+
+def cache_enabled() -> bool:
+    """Check the env flag at call time (load_dotenv runs after import)"""
+    return os.getenv("PETONCLE_LLM_CACHE") == "1"
+
+
+def get_cache() -> diskcache.Cache:
+    """Open the on-disk cache lazily so disabled runs never touch the disk"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = diskcache.Cache(os.path.expanduser(CACHE_DIR))
+    return _cache
+
+
+def make_key(model: str, messages: list[dict], max_tokens: int) -> str:
+    """Build a stable cache key for a completion request"""
+    payload = json.dumps({"m": model, "mt": max_tokens, "msgs": messages}, sort_keys=True)
+    return hashlib.blake2b(payload.encode()).hexdigest()
+
+
+def _lookup(model: str, messages: list[dict], max_tokens: int) -> tuple[str, str | None]:
+    """Return (key, cached content or None) for a completion request"""
+    key = make_key(model, messages, max_tokens)
+    return key, get_cache().get(key)
+
+
+def _store(key: str, content: str):
+    """Store a completion's text under its key"""
+    get_cache().set(key, content, expire=CACHE_TTL)
+
+
+def cached_llm(func):
+    """
+    Cache the text returned by a completion function
+
+    The wrapped function must have the signature
+    (client, model, messages, max_tokens) -> str.
+    """
+    @wraps(func)
+    def wrapper(client, model: str, messages: list[dict], max_tokens: int) -> str:
+        if not cache_enabled():
+            return func(client, model, messages, max_tokens)
+
+        key, content = _lookup(model, messages, max_tokens)
+        if content is None:
+            content = func(client, model, messages, max_tokens)
+            _store(key, content)
+        return content
+
+    return wrapper
+
+
+def cached_llm_async(func):
+    """
+    Coroutine counterpart of cached_llm
+
+    diskcache is synchronous SQLite (with a lock shared between processes),
+    so lookups and stores run in a thread to keep the event loop free.
+    """
+    @wraps(func)
+    async def wrapper(client, model: str, messages: list[dict], max_tokens: int) -> str:
+        if not cache_enabled():
+            return await func(client, model, messages, max_tokens)
+
+        key, content = await asyncio.to_thread(_lookup, model, messages, max_tokens)
+        if content is None:
+            content = await func(client, model, messages, max_tokens)
+            await asyncio.to_thread(_store, key, content)
+        return content
+
+    return wrapper
+
+
+def cached_llm_stream_async(func):
+    """
+    Streaming counterpart of cached_llm_async, sharing the same entries
+
+    A hit is replayed as a single chunk; on a miss the chunks are passed
+    through and their concatenation is stored once the stream completes.
+    Cache I/O runs in a thread, as in cached_llm_async.
+    """
+    @wraps(func)
+    async def wrapper(client, model: str, messages: list[dict], max_tokens: int) -> AsyncIterator[str]:
+        if not cache_enabled():
+            async for chunk in func(client, model, messages, max_tokens):
+                yield chunk
+            return
+
+        key, content = await asyncio.to_thread(_lookup, model, messages, max_tokens)
+        if content is not None:
+            yield content
+            return
+
+        chunks = []
+        async for chunk in func(client, model, messages, max_tokens):
+            chunks.append(chunk)
+            yield chunk
+        await asyncio.to_thread(_store, key, "".join(chunks))
+
+    return wrapper
@@ -0,0 +1,135 @@
+"""
+Shared Mistral client and completion helpers for all agents
+"""
+import asyncio
+import os
+from functools import lru_cache
+from typing import AsyncIterator
+
+import httpx
+from mistralai import Mistral
+
+from ._cache import cached_llm, cached_llm_async, cached_llm_stream_async, make_key
+
+
+API_TIMEOUT_MS = 30000  # 30 seconds timeout for API calls
+
+# One HTTP/2 pool shared by every agent
+POOL_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+
+def get_client(api_key: str = None) -> Mistral:
+    """
+    Get the process-wide Mistral client
+
+    Args:
+        api_key: Mistral API key (defaults to MISTRAL_API_KEY env var)
+
+    Returns:
+        A Mistral client reused by every agent using the same key
+    """
+    api_key = api_key or os.getenv("MISTRAL_API_KEY")
+    if not api_key:
+        raise ValueError("MISTRAL_API_KEY not provided")
+
+    return _client_for_key(api_key)
+
+
+@lru_cache(maxsize=4)
+def _client_for_key(api_key: str) -> Mistral:
+    """Build one client per API key, resolved from the env beforehand"""
+    return Mistral(
+        api_key=api_key,
+        timeout_ms=API_TIMEOUT_MS,
+        client=httpx.Client(http2=True, limits=POOL_LIMITS),
+        async_client=httpx.AsyncClient(http2=True, limits=POOL_LIMITS),
+    )
+
+
+async def warmup(client: Mistral):
+    """
+    Open the async connection pool ahead of the first request
+
+    Listing models is free and forces DNS, TLS and HTTP/2 session setup,
+    which the first chat call would otherwise pay for.
+    """
+    await client.models.list_async()
+
+
+@cached_llm
+def complete(client: Mistral, model: str, messages: list[dict], max_tokens: int) -> str:
+    """Call Mistral and return the assistant text"""
+    response = client.chat.complete(
+        model=model,
+        messages=messages,
+        max_tokens=max_tokens
+    )
+
+    return response.choices[0].message.content
+
+
+@cached_llm_async
+async def acomplete(client: Mistral, model: str, messages: list[dict], max_tokens: int) -> str:
+    """Async version of complete, awaiting the call instead of blocking"""
+    response = await client.chat.complete_async(
+        model=model,
+        messages=messages,
+        max_tokens=max_tokens
+    )
+
+    return response.choices[0].message.content
+
+
+@cached_llm_stream_async
+async def acomplete_stream(client: Mistral, model: str, messages: list[dict], max_tokens: int) -> AsyncIterator[str]:
+    """Call Mistral in streaming mode and yield the assistant text as it arrives"""
+    events = await client.chat.stream_async(
+        model=model,
+        messages=messages,
+        max_tokens=max_tokens
+    )
+    async for event in events:
+        content = event.data.choices[0].delta.content
+        if content:
+            yield content
+
+
+class MistralBatcher:
+    """
+    Coalesce identical in-flight completions into a single Mistral call
+
+    Mistral's chat endpoint takes one prompt per request, so concurrent
+    requests can only share a call when they are the same request; every
+    caller awaiting a given (model, messages, max_tokens) gets the result
+    of the one call already running for it.
+    """
+
+    def __init__(self, client: Mistral):
+        self.client = client
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    async def submit(self, model: str, messages: list[dict], max_tokens: int) -> str:
+        """Complete a request, joining an identical in-flight call if any"""
+        key = make_key(model, messages, max_tokens)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(acomplete(self.client, model, messages, max_tokens))
+            self._in_flight[key] = future
+            future.add_done_callback(lambda f: self._done(key, f))
+
+        # Shielded so a cancelled caller does not cancel the call for the others
+        return await asyncio.shield(future)
+
+    def _done(self, key: str, future: asyncio.Future):
+        """Forget a finished call and mark its exception as retrieved"""
+        self._in_flight.pop(key, None)
+        # If every waiter was cancelled, nobody else reads the exception and
+        # asyncio would log "Task exception was never retrieved"
+        if not future.cancelled():
+            future.exception()
+
+
+@lru_cache(maxsize=4)
+def get_batcher(client: Mistral) -> MistralBatcher:
+    """Get the batcher shared by every agent using this client"""
+    return MistralBatcher(client)
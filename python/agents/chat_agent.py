@@ -1,34 +1,49 @@
 """
 Chat agent using Mistral API for terminal assistance
 """
-import os
+from collections import deque
+from functools import lru_cache
+from typing import AsyncIterator
+
 from mistralai import Mistral
 
+from ._client import API_TIMEOUT_MS, acomplete_stream, complete, get_batcher, get_client
+
 
 class ChatAgent:
     """Agent that handles chat interactions using Mistral API"""
 
     # Maximum number of messages to keep in history (user + assistant pairs)
     MAX_HISTORY_MESSAGES = 20  # Keep last 10 exchanges (20 messages)
-    API_TIMEOUT = 30.0  # 30 seconds timeout for API calls
+    API_TIMEOUT = API_TIMEOUT_MS / 1000  # Shared client timeout, in seconds
 
-    def __init__(self, api_key: str = None):
+    MODEL = "mistral-small-latest"
+    MAX_TOKENS = 1024
+
+    SYSTEM_PROMPT = """You are Petoncle, an AI assistant for pentesters and security researchers.
+You help users with terminal commands, security tools, and cybersecurity tasks.
+
+Key capabilities:
+- Suggest shell commands for security testing
+- Explain security tools (nmap, sqlmap, metasploit, etc.)
+- Help with penetration testing workflows
+- Provide command examples
+
+Always be helpful, concise, and security-focused.
+"""
+
+    def __init__(self, api_key: str = None, client: Mistral = None):
         """
         Initialize the chat agent
 
         Args:
             api_key: Mistral API key (defaults to MISTRAL_API_KEY env var)
+            client: Optional Mistral client (defaults to the shared one)
         """
-        self.api_key = api_key or os.getenv("MISTRAL_API_KEY")
-        if not self.api_key:
-            raise ValueError("MISTRAL_API_KEY not provided")
-
-        # Initialize Mistral client with timeout (in milliseconds)
-        self.client = Mistral(
-            api_key=self.api_key,
-            timeout_ms=int(self.API_TIMEOUT * 1000)  # Convert seconds to milliseconds
-        )
-        self.conversation_history = []
+        self.client = client or get_client(api_key)
+        self.batcher = get_batcher(self.client)
+        # Bounded history: appending past the limit drops the oldest message
+        self.conversation_history = deque(maxlen=self.MAX_HISTORY_MESSAGES)
 
     def chat(self, message: str, context: list[str] = None) -> str:
         """
@@ -41,23 +56,80 @@ class ChatAgent:
         Returns:
             AI response message
         """
-        # Build system prompt with terminal context
-        system_prompt = """You are Petoncle, an AI assistant for pentesters and security researchers.
-You help users with terminal commands, security tools, and cybersecurity tasks.
+        messages = self._start_turn(message, context)
 
-Key capabilities:
-- Suggest shell commands for security testing
-- Explain security tools (nmap, sqlmap, metasploit, etc.)
-- Help with penetration testing workflows
-- Provide command examples
+        # Call Mistral API with timeout handling
+        try:
+            assistant_message = complete(self.client, self.MODEL, messages, self.MAX_TOKENS)
+        except Exception as e:
+            self._fail_turn(messages[-1], e)
 
-Always be helpful, concise, and security-focused.
-"""
+        self._end_turn(assistant_message)
 
-        # Add command history context if provided
-        if context:
-            context_str = "\n".join(f"$ {cmd}" for cmd in context[-5:])  # Last 5 commands
-            system_prompt += f"\n\nRecent terminal commands:\n{context_str}"
+        return assistant_message
+
+    async def achat(self, message: str, context: list[str] = None) -> str:
+        """Async version of chat"""
+        messages = self._start_turn(message, context)
+
+        try:
+            assistant_message = await self.batcher.submit(self.MODEL, messages, self.MAX_TOKENS)
+        except Exception as e:
+            self._fail_turn(messages[-1], e)
+        except BaseException:
+            # Cancelled (client deadline or disconnect): forget the turn as is
+            self._drop_turn(messages[-1])
+            raise
+
+        self._end_turn(assistant_message)
+
+        return assistant_message
+
+    async def astream(self, message: str, context: list[str] = None) -> AsyncIterator[str]:
+        """Same as achat, yielding the response as it is generated"""
+        messages = self._start_turn(message, context)
+
+        chunks = []
+        try:
+            async for chunk in acomplete_stream(self.client, self.MODEL, messages, self.MAX_TOKENS):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            self._fail_turn(messages[-1], e)
+        except BaseException:
+            # Cancelled or closed early (GeneratorExit): forget the turn as is
+            self._drop_turn(messages[-1])
+            raise
+
+        self._end_turn("".join(chunks))
+
+    def _fail_turn(self, user_message: dict, e: Exception):
+        """
+        Drop an unanswered user turn and re-raise its Mistral API error,
+        mapping timeouts and connection errors
+        """
+        self._drop_turn(user_message)
+
+        error_msg = str(e).lower()
+        if 'timeout' in error_msg:
+            raise TimeoutError(f"Mistral API call timed out after {self.API_TIMEOUT}s")
+        elif 'connection' in error_msg or 'network' in error_msg:
+            raise ConnectionError(f"Mistral API connection error: {e}")
+        else:
+            raise e
+
+    def _drop_turn(self, user_message: dict):
+        """Remove an unanswered user message from the history"""
+        # Match this exact message (other turns may have been added since)
+        for i in range(len(self.conversation_history) - 1, -1, -1):
+            if self.conversation_history[i] is user_message:
+                del self.conversation_history[i]
+                break
+
+    def _start_turn(self, message: str, context: list[str] = None) -> list[dict]:
+        """Record the user message and build the Mistral messages for this turn"""
+        # Build system prompt with terminal context (last 5 commands)
+        system_message = self._system_message(tuple(context[-5:]) if context else ())
 
         # Add user message to history
         self.conversation_history.append({
@@ -66,43 +138,26 @@ Always be helpful, concise, and security-focused.
         })
 
         # Prepare messages with system prompt
-        messages = [
-            {"role": "system", "content": system_prompt}
-        ] + self.conversation_history
+        return [system_message, *self.conversation_history]
 
-        # Call Mistral API with timeout handling
-        try:
-            response = self.client.chat.complete(
-                model="mistral-small-latest",
-                messages=messages,
-                max_tokens=1024
-            )
-        except Exception as e:
-            # Handle timeout and connection errors
-            error_msg = str(e).lower()
-            if 'timeout' in error_msg:
-                raise TimeoutError(f"Mistral API call timed out after {self.API_TIMEOUT}s")
-            elif 'connection' in error_msg or 'network' in error_msg:
-                raise ConnectionError(f"Mistral API connection error: {e}")
-            else:
-                raise
-
-        # Extract response text
-        assistant_message = response.choices[0].message.content
-
-        # Add to history
+    def _end_turn(self, assistant_message: str):
+        """Record the assistant reply in the history"""
         self.conversation_history.append({
             "role": "assistant",
             "content": assistant_message
         })
 
-        # Trim history if it exceeds max size (keep system prompt + recent messages)
-        if len(self.conversation_history) > self.MAX_HISTORY_MESSAGES:
-            # Keep only the most recent messages
-            self.conversation_history = self.conversation_history[-self.MAX_HISTORY_MESSAGES:]
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _system_message(context: tuple[str, ...]) -> dict:
+        """Build the system message for a given command tail (cached, do not mutate)"""
+        system_prompt = ChatAgent.SYSTEM_PROMPT
+        if context:
+            context_str = "\n".join(f"$ {cmd}" for cmd in context)
+            system_prompt += f"\n\nRecent terminal commands:\n{context_str}"
 
-        return assistant_message
+        return {"role": "system", "content": system_prompt}
 
     def reset(self):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
@@ -1,7 +1,10 @@
 """
 LangGraph workflow for multi-agent system
 """
+import os
+from functools import lru_cache
 from typing import TypedDict, Literal, Annotated
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 import operator
 
@@ -10,6 +13,7 @@ from .toolsmith import Toolsmith
 from .researcher import Researcher
 from .scribe import Scribe
 from .chat_agent import ChatAgent
+from ._client import get_client, warmup
 
 
 class AgentState(TypedDict):
@@ -43,18 +47,55 @@ class MultiAgentSystem:
     1. User input → Orchestrator (routing)
     2. Orchestrator → Specialist agent (processing)
     3. Specialist → Response
+
+    This single hop is dispatched directly by default; the LangGraph
+    workflow only runs when use_graph is set (or PETONCLE_USE_GRAPH=1),
+    for multi-hop flows built on top of it.
     """
 
-    def __init__(self, api_key: str = None):
-        """Initialize all agents"""
+    GRAPH_RECURSION_LIMIT = 5  # Max graph steps per request
+
+    def __init__(self, api_key: str = None, use_graph: bool = None):
+        """Initialize all agents around a single shared Mistral client"""
+        client = get_client(api_key)
+        self.client = client
+        if use_graph is None:
+            use_graph = os.getenv("PETONCLE_USE_GRAPH") == "1"
+
         self.orchestrator = Orchestrator()
-        self.toolsmith = Toolsmith(api_key)
-        self.researcher = Researcher(api_key)
-        self.scribe = Scribe(api_key)
-        self.general_agent = ChatAgent(api_key)
+        self.toolsmith = Toolsmith(client=client)
+        self.researcher = Researcher(client=client)
+        self.scribe = Scribe(client=client)
+        self.general_agent = ChatAgent(client=client)
+
+        # Specialists by routing name
+        self.agents = {
+            "toolsmith": self.toolsmith,
+            "researcher": self.researcher,
+            "scribe": self.scribe,
+            "general": self.general_agent,
+        }
+
+        # Request handlers by routing name, for the direct path
+        self.handlers = {
+            "toolsmith": self.toolsmith.process,
+            "researcher": self.researcher.process,
+            "scribe": self.scribe.process,
+            "general": self.general_agent.chat,
+        }
+        self.async_handlers = {
+            "toolsmith": self.toolsmith.aprocess,
+            "researcher": self.researcher.aprocess,
+            "scribe": self.scribe.aprocess,
+            "general": self.general_agent.achat,
+        }
 
         # Build the graph
-        self.graph = self._build_graph()
+        self.graph = self._build_graph() if use_graph else None
+
+    async def warmup(self):
+        """Establish the shared client's connections before serving"""
+        await warmup(self.client)
 
     def _build_graph(self) -> StateGraph:
         """
@@ -65,12 +106,12 @@ class MultiAgentSystem:
         """
         workflow = StateGraph(AgentState)
 
-        # Add nodes
+        # Add nodes (specialists get an async twin, used by ainvoke)
         workflow.add_node("orchestrate", self._orchestrate_node)
-        workflow.add_node("toolsmith", self._toolsmith_node)
-        workflow.add_node("researcher", self._researcher_node)
-        workflow.add_node("scribe", self._scribe_node)
-        workflow.add_node("general", self._general_node)
+        workflow.add_node("toolsmith", RunnableLambda(self._toolsmith_node, afunc=self._atoolsmith_node))
+        workflow.add_node("researcher", RunnableLambda(self._researcher_node, afunc=self._aresearcher_node))
+        workflow.add_node("scribe", RunnableLambda(self._scribe_node, afunc=self._ascribe_node))
+        workflow.add_node("general", RunnableLambda(self._general_node, afunc=self._ageneral_node))
 
         # Set entry point
         workflow.set_entry_point("orchestrate")
@@ -93,16 +134,16 @@ class MultiAgentSystem:
         workflow.add_edge("scribe", END)
         workflow.add_edge("general", END)
 
-        return workflow.compile()
+        # The flow is two steps; fail fast rather than loop if that changes
+        return workflow.compile().with_config(recursion_limit=self.GRAPH_RECURSION_LIMIT)
 
-    def _orchestrate_node(self, state: AgentState) -> AgentState:
+    def _orchestrate_node(self, state: AgentState) -> dict:
         """
         Orchestrator node: Detect intent and route
         """
         routing = self.orchestrator.route(state["message"])
 
         return {
-            **state,
             "intent": routing["intent"],
             "agent": routing["agent"],
             "steps": ["orchestrate"]
@@ -114,50 +155,107 @@ class MultiAgentSystem:
         """
         return state["agent"]
 
-    def _toolsmith_node(self, state: AgentState) -> AgentState:
+    def _toolsmith_node(self, state: AgentState) -> dict:
         """Toolsmith node: Handle command syntax queries"""
         response = self.toolsmith.process(state["message"], state.get("context"))
 
         return {
-            **state,
             "response": response,
             "agent_used": "toolsmith",
             "steps": ["toolsmith"]
         }
 
-    def _researcher_node(self, state: AgentState) -> AgentState:
+    async def _atoolsmith_node(self, state: AgentState) -> dict:
+        """Async version of _toolsmith_node"""
+        response = await self.toolsmith.aprocess(state["message"], state.get("context"))
+
+        return {
+            "response": response,
+            "agent_used": "toolsmith",
+            "steps": ["toolsmith"]
+        }
+
+    def _researcher_node(self, state: AgentState) -> dict:
         """Researcher node: Handle OSINT and vulnerability research"""
         response = self.researcher.process(state["message"], state.get("context"))
 
         return {
-            **state,
             "response": response,
             "agent_used": "researcher",
             "steps": ["researcher"]
         }
 
-    def _scribe_node(self, state: AgentState) -> AgentState:
+    async def _aresearcher_node(self, state: AgentState) -> dict:
+        """Async version of _researcher_node"""
+        response = await self.researcher.aprocess(state["message"], state.get("context"))
+
+        return {
+            "response": response,
+            "agent_used": "researcher",
+            "steps": ["researcher"]
+        }
+
+    def _scribe_node(self, state: AgentState) -> dict:
         """Scribe node: Handle report generation"""
         response = self.scribe.process(state["message"], state.get("context"))
 
         return {
-            **state,
             "response": response,
             "agent_used": "scribe",
             "steps": ["scribe"]
         }
 
-    def _general_node(self, state: AgentState) -> AgentState:
+    async def _ascribe_node(self, state: AgentState) -> dict:
+        """Async version of _scribe_node"""
+        response = await self.scribe.aprocess(state["message"], state.get("context"))
+
+        return {
+            "response": response,
+            "agent_used": "scribe",
+            "steps": ["scribe"]
+        }
+
+    def _general_node(self, state: AgentState) -> dict:
         """General node: Handle generic queries (fallback)"""
         response = self.general_agent.chat(state["message"], state.get("context"))
 
         return {
-            **state,
             "response": response,
             "agent_used": "general",
             "steps": ["general"]
         }
 
+    async def _ageneral_node(self, state: AgentState) -> dict:
+        """Async version of _general_node"""
+        response = await self.general_agent.achat(state["message"], state.get("context"))
+
+        return {
+            "response": response,
+            "agent_used": "general",
+            "steps": ["general"]
+        }
+
+    def _initial_state(self, message: str, context: list[str] = None) -> AgentState:
+        """Build the graph input state for a message"""
+        return {
+            "message": message,
+            "context": context or [],
+            "intent": "",
+            "agent": "",
+            "response": "",
+            "agent_used": "",
+            "steps": []
+        }
+
+    def _result(self, routing: dict, response: str) -> dict:
+        """Build the process() result for a directly dispatched request"""
+        return {
+            "response": response,
+            "agent": routing["agent"],
+            "intent": routing["intent"],
+            "steps": ["orchestrate", routing["agent"]]  # Same as the graph's
+        }
+
     def process(self, message: str, context: list[str] = None) -> dict:
         """
         Process a message through the multi-agent system
@@ -169,18 +267,29 @@ class MultiAgentSystem:
         Returns:
             dict with 'response' and 'agent_used'
         """
-        initial_state: AgentState = {
-            "message": message,
-            "context": context or [],
-            "intent": "",
-            "agent": "",
-            "response": "",
-            "agent_used": "",
-            "steps": []
-        }
+        if self.graph is None:
+            routing = self.orchestrator.route(message)
+            response = self.handlers[routing["agent"]](message, context or [])
+            return self._result(routing, response)
 
         # Run the graph
-        final_state = self.graph.invoke(initial_state)
+        final_state = self.graph.invoke(self._initial_state(message, context))
+
+        return {
+            "response": final_state["response"],
+            "agent": final_state["agent_used"],
+            "intent": final_state["intent"],
+            "steps": final_state["steps"]  # For debugging
+        }
+
+    async def aprocess(self, message: str, context: list[str] = None) -> dict:
+        """Async version of process, running the graph with ainvoke"""
+        if self.graph is None:
+            routing = self.orchestrator.route(message)
+            response = await self.async_handlers[routing["agent"]](message, context or [])
+            return self._result(routing, response)
+
+        final_state = await self.graph.ainvoke(self._initial_state(message, context))
 
         return {
             "response": final_state["response"],
@@ -188,3 +297,36 @@ class MultiAgentSystem:
             "intent": final_state["intent"],
             "steps": final_state["steps"]  # For debugging
         }
+
+    def astream(self, message: str, context: list[str] = None) -> dict:
+        """
+        Route a message and stream the specialist's response
+
+        The graph only holds complete responses, so streaming routes through
+        the orchestrator directly and hands back the agent's chunk iterator.
+
+        Args:
+            message: User message
+            context: Optional command history
+
+        Returns:
+            dict with 'chunks' (async iterator of response text), 'agent' and 'intent'
+        """
+        routing = self.orchestrator.route(message)
+
+        return {
+            "chunks": self.agents[routing["agent"]].astream(message, context or []),
+            "agent": routing["agent"],
+            "intent": routing["intent"]
+        }
+
+
+@lru_cache(maxsize=1)
+def get_system() -> MultiAgentSystem:
+    """
+    Get the process-wide multi-agent system
+
+    Building it creates every agent (and the graph, if enabled), so it is
+    done once and shared by all requests.
+    """
+    return MultiAgentSystem()
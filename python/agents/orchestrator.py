@@ -1,54 +1,89 @@
 """
 Orchestrator Agent - Routes requests to specialized agents
 """
+from functools import lru_cache
 from typing import Literal
 
+import ahocorasick
+
+
+def _build_automaton(intent_keywords: dict[str, frozenset[str]]) -> ahocorasick.Automaton:
+    """Compile every intent keyword into a single Aho-Corasick automaton"""
+    automaton = ahocorasick.Automaton()
+    for intent, keywords in intent_keywords.items():
+        for keyword in keywords:
+            automaton.add_word(keyword, (intent, keyword))
+    automaton.make_automaton()
+    return automaton
+
 
 class Orchestrator:
     """
     Orchestrator agent that analyzes user intent and routes to the appropriate specialist
     """
 
-    # Intent keywords mapping
+    # Intent keywords mapping (frozen: the automaton below is built from it once)
     INTENT_KEYWORDS = {
-        "command_help": [
+        "command_help": frozenset({
             "comment", "syntaxe", "utiliser", "commande", "command",
             "option", "flag", "paramètre", "exemple"
-        ],
-        "research": [
+        }),
+        "research": frozenset({
             "cve", "vulnérabilité", "vulnerability", "exploit", "recherche",
             "chercher", "trouver", "poc", "proof of concept", "security advisory"
-        ],
-        "report": [
+        }),
+        "report": frozenset({
             "rapport", "report", "résumé", "summary", "historique",
             "history", "logs", "documentation", "documenter"
-        ],
+        }),
     }
 
-    def detect_intent(self, message: str) -> Literal["command_help", "research", "report", "general"]:
+    # Scans a message for all intents' keywords in one pass
+    _KEYWORD_AUTOMATON = _build_automaton(INTENT_KEYWORDS)
+
+    # Memoization of detect_intent; longer messages bypass the cache so
+    # pathological inputs cannot blow up its memory footprint
+    INTENT_CACHE_SIZE = 4096
+    MAX_CACHED_MESSAGE_LENGTH = 512
+
+    @staticmethod
+    def detect_intent(message_lower: str) -> Literal["command_help", "research", "report", "general"]:
         """
         Detect user intent from message
 
         Args:
-            message: User message to analyze
+            message_lower: Lowercased user message to analyze
 
         Returns:
             Intent type: command_help, research, report, or general
         """
-        message_lower = message.lower()
+        if len(message_lower) > Orchestrator.MAX_CACHED_MESSAGE_LENGTH:
+            return Orchestrator._match_intent(message_lower)
+        return Orchestrator._match_intent_cached(message_lower)
+
+    @staticmethod
+    @lru_cache(maxsize=INTENT_CACHE_SIZE)
+    def _match_intent_cached(message_lower: str) -> str:
+        """Memoized _match_intent (lru_cache is thread-safe)"""
+        return Orchestrator._match_intent(message_lower)
 
-        # Count keyword matches for each intent
-        scores = {}
-        for intent, keywords in self.INTENT_KEYWORDS.items():
-            score = sum(1 for keyword in keywords if keyword in message_lower)
-            scores[intent] = score
+    @staticmethod
+    def _match_intent(message_lower: str) -> str:
+        """Score each intent against the message and pick the best one"""
+        # Collect distinct keyword matches for each intent (a keyword repeated
+        # in the message still counts once)
+        matches = {intent: set() for intent in Orchestrator.INTENT_KEYWORDS}
+        for _, (intent, keyword) in Orchestrator._KEYWORD_AUTOMATON.iter(message_lower):
+            matches[intent].add(keyword)
 
-        # Return intent with highest score (if > 0)
-        if max(scores.values()) > 0:
-            return max(scores, key=scores.get)
+        # Return intent with highest score in one pass (first one wins ties),
+        # defaulting to general if no strong intent detected
+        best, best_score = "general", 0
+        for intent, keywords in matches.items():
+            if len(keywords) > best_score:
+                best, best_score = intent, len(keywords)
 
-        # Default to general if no strong intent detected
-        return "general"
+        return best
 
     def route(self, message: str) -> dict:
         """
@@ -60,7 +95,7 @@ class Orchestrator:
         Returns:
             Routing decision with agent name and confidence
         """
-        intent = self.detect_intent(message)
+        intent = self.detect_intent(message.lower())
 
         routing = {
             "command_help": "toolsmith",
@@ -1,8 +1,11 @@
 """
 Researcher Agent - OSINT and web search specialist
 """
+from typing import AsyncIterator
+
 from mistralai import Mistral
-import os
+
+from ._client import acomplete_stream, complete, get_batcher, get_client
 
 
 class Researcher:
@@ -39,13 +42,16 @@ class Researcher:
 - Pratique et actionnable
 """
 
-    def __init__(self, api_key: str = None):
-        """Initialize Researcher with Mistral client"""
-        self.api_key = api_key or os.getenv("MISTRAL_API_KEY")
-        if not self.api_key:
-            raise ValueError("MISTRAL_API_KEY not provided")
+    MODEL = "mistral-small-latest"
+    MAX_TOKENS = 1024
 
-        self.client = Mistral(api_key=self.api_key, timeout_ms=30000)
+    # Built once at class load, shared by every request
+    SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+    def __init__(self, api_key: str = None, client: Mistral = None):
+        """Initialize Researcher with the shared Mistral client (or an injected one)"""
+        self.client = client or get_client(api_key)
+        self.batcher = get_batcher(self.client)
 
         # TODO: Add Tavily integration for web search
         # self.tavily_key = os.getenv("TAVILY_API_KEY")
@@ -61,18 +67,22 @@ class Researcher:
         Returns:
             Research results and analysis
         """
-        messages = [
-            {"role": "system", "content": self.SYSTEM_PROMPT},
-            {"role": "user", "content": message}
-        ]
+        return complete(self.client, self.MODEL, self._build_messages(message, context), self.MAX_TOKENS)
+
+    async def aprocess(self, message: str, context: list[str] = None) -> str:
+        """Async version of process"""
+        return await self.batcher.submit(self.MODEL, self._build_messages(message, context), self.MAX_TOKENS)
 
-        response = self.client.chat.complete(
-            model="mistral-small-latest",
-            messages=messages,
-            max_tokens=1024
-        )
+    def astream(self, message: str, context: list[str] = None) -> AsyncIterator[str]:
+        """Same as aprocess, yielding the response as it is generated"""
+        return acomplete_stream(self.client, self.MODEL, self._build_messages(message, context), self.MAX_TOKENS)
 
-        return response.choices[0].message.content
+    def _build_messages(self, message: str, context: list[str] = None) -> list[dict]:
+        """Build the Mistral messages for a request"""
+        return [
+            self.SYSTEM_MESSAGE,
+            {"role": "user", "content": message}
+        ]
 
     # TODO: Implement web search with Tavily
     # def search_web(self, query: str) -> list[dict]:
@@ -1,8 +1,12 @@
 """
 Scribe Agent - Report generation specialist
 """
+from functools import lru_cache
+from typing import AsyncIterator
+
 from mistralai import Mistral
-import os
+
+from ._client import acomplete_stream, complete, get_batcher, get_client
 
 
 class Scribe:
@@ -38,13 +42,13 @@ class Scribe:
 - Actionnable
 """
 
-    def __init__(self, api_key: str = None):
-        """Initialize Scribe with Mistral client"""
-        self.api_key = api_key or os.getenv("MISTRAL_API_KEY")
-        if not self.api_key:
-            raise ValueError("MISTRAL_API_KEY not provided")
+    MODEL = "mistral-small-latest"
+    MAX_TOKENS = 2048  # More tokens for reports
 
-        self.client = Mistral(api_key=self.api_key, timeout_ms=30000)
+    def __init__(self, api_key: str = None, client: Mistral = None):
+        """Initialize Scribe with the shared Mistral client (or an injected one)"""
+        self.client = client or get_client(api_key)
+        self.batcher = get_batcher(self.client)
 
     def process(self, message: str, context: list[str] = None) -> str:
         """
@@ -57,21 +61,33 @@ class Scribe:
         Returns:
             Generated report or documentation
         """
-        # Add command history context if available
-        system_prompt = self.SYSTEM_PROMPT
-        if context:
-            history_str = "\n".join(f"- {cmd}" for cmd in context[-10:])  # Last 10 commands
-            system_prompt += f"\n\n**Historique des commandes récentes:**\n{history_str}"
+        return complete(self.client, self.MODEL, self._build_messages(message, context), self.MAX_TOKENS)
+
+    async def aprocess(self, message: str, context: list[str] = None) -> str:
+        """Async version of process"""
+        return await self.batcher.submit(self.MODEL, self._build_messages(message, context), self.MAX_TOKENS)
 
-        messages = [
-            {"role": "system", "content": system_prompt},
+    def astream(self, message: str, context: list[str] = None) -> AsyncIterator[str]:
+        """Same as aprocess, yielding the report as it is generated"""
+        return acomplete_stream(self.client, self.MODEL, self._build_messages(message, context), self.MAX_TOKENS)
+
+    def _build_messages(self, message: str, context: list[str] = None) -> list[dict]:
+        """Build the Mistral messages, with command history context if available"""
+        # Last 10 commands
+        system_message = self._system_message(tuple(context[-10:]) if context else ())
+
+        return [
+            system_message,
             {"role": "user", "content": message}
         ]
 
-        response = self.client.chat.complete(
-            model="mistral-small-latest",
-            messages=messages,
-            max_tokens=2048  # More tokens for reports
-        )
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _system_message(context: tuple[str, ...]) -> dict:
+        """Build the system message for a given command history (cached, do not mutate)"""
+        system_prompt = Scribe.SYSTEM_PROMPT
+        if context:
+            history_str = "\n".join(f"- {cmd}" for cmd in context)
+            system_prompt += f"\n\n**Historique des commandes récentes:**\n{history_str}"
 
-        return response.choices[0].message.content
+        return {"role": "system", "content": system_prompt}
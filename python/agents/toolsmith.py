@@ -1,8 +1,11 @@
 """
 Toolsmith Agent - CLI syntax expert for pentesting tools
 """
+from typing import AsyncIterator
+
 from mistralai import Mistral
-import os
+
+from ._client import acomplete_stream, complete, get_batcher, get_client
 
 
 class Toolsmith:
@@ -58,13 +61,16 @@ class Toolsmith:
 - Mentionne les risques si nécessaire
 """
 
-    def __init__(self, api_key: str = None):
-        """Initialize Toolsmith with Mistral client"""
-        self.api_key = api_key or os.getenv("MISTRAL_API_KEY")
-        if not self.api_key:
-            raise ValueError("MISTRAL_API_KEY not provided")
+    MODEL = "mistral-small-latest"
+    MAX_TOKENS = 1024
 
-        self.client = Mistral(api_key=self.api_key, timeout_ms=30000)
+    # Built once at class load, shared by every request
+    SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+    def __init__(self, api_key: str = None, client: Mistral = None):
+        """Initialize Toolsmith with the shared Mistral client (or an injected one)"""
+        self.client = client or get_client(api_key)
+        self.batcher = get_batcher(self.client)
 
     def process(self, message: str, context: list[str] = None) -> str:
         """
@@ -77,15 +83,19 @@ class Toolsmith:
         Returns:
             Expert response about the command
         """
-        messages = [
-            {"role": "system", "content": self.SYSTEM_PROMPT},
-            {"role": "user", "content": message}
-        ]
+        return complete(self.client, self.MODEL, self._build_messages(message, context), self.MAX_TOKENS)
+
+    async def aprocess(self, message: str, context: list[str] = None) -> str:
+        """Async version of process"""
+        return await self.batcher.submit(self.MODEL, self._build_messages(message, context), self.MAX_TOKENS)
 
-        response = self.client.chat.complete(
-            model="mistral-small-latest",
-            messages=messages,
-            max_tokens=1024
-        )
+    def astream(self, message: str, context: list[str] = None) -> AsyncIterator[str]:
+        """Same as aprocess, yielding the response as it is generated"""
+        return acomplete_stream(self.client, self.MODEL, self._build_messages(message, context), self.MAX_TOKENS)
 
-        return response.choices[0].message.content
+    def _build_messages(self, message: str, context: list[str] = None) -> list[dict]:
+        """Build the Mistral messages for a request"""
+        return [
+            self.SYSTEM_MESSAGE,
+            {"role": "user", "content": message}
+        ]
@@ -10,7 +10,7 @@ use ratatui::{
     Frame, Terminal,
 };
 use std::io::Stdout;
-use std::sync::mpsc::{self, Receiver, Sender};
+use std::sync::mpsc::{self, Receiver, Sender, TryRecvError};
 use std::thread;
 use std::time::{Duration, Instant};
 use tokio::runtime::Runtime;
@@ -38,6 +38,14 @@ pub struct ChatMessage {
     pub agent: Option<String>, // Which agent handled this message (toolsmith, researcher, scribe, general)
 }
 
+/// Update sent by the gRPC thread while a response is streamed
+#[derive(Debug, Clone)]
+pub enum ResponseUpdate {
+    Chunk(String, String), // (text, agent) as it arrives
+    Failed(String),        // Error text, ends the response
+    Done,                  // Empty terminal message received
+}
+
 // Spinner frames for loading animation
 const SPINNER_FRAMES: &[&str] = &["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"];
 
@@ -49,7 +57,7 @@ pub struct ChatState {
     pub last_visible_height: u16, // Last known visible height of messages area
     pub spinner_frame: usize, // Current spinner frame index
     pub last_spinner_update: Instant, // Last time spinner was updated
-    pub response_receiver: Option<Receiver<Result<(String, String)>>>, // Channel to receive async responses (message, agent)
+    pub response_receiver: Option<Receiver<ResponseUpdate>>, // Channel to receive streamed responses
     grpc_client: AgentClient,
     runtime: Runtime,
 }
@@ -174,6 +182,23 @@ impl ChatState {
         }
     }
 
+    /// Append a streamed chunk to the last message, replacing the loading text on the first one
+    pub fn append_to_last_message(&mut self, chunk: &str, agent: Option<String>) {
+        if let Some(last) = self.messages.last_mut() {
+            if let MessageState::Loading = last.state {
+                last.content.clear();
+                last.state = MessageState::Ready;
+            }
+            last.content.push_str(chunk);
+            last.agent = agent;
+            self.auto_scroll = true;
+        }
+    }
+
+    fn last_message_loading(&self) -> bool {
+        matches!(self.messages.last(), Some(ChatMessage { state: MessageState::Loading, .. }))
+    }
+
     pub fn clear_input(&mut self) {
         self.input.clear();
     }
@@ -181,7 +206,7 @@ impl ChatState {
     /// Start generating AI response asynchronously (non-blocking)
     pub fn start_generate_response(&mut self, user_input: String) {
         // Create channel for async communication
-        let (tx, rx): (Sender<Result<(String, String)>>, Receiver<Result<(String, String)>>) = mpsc::channel();
+        let (tx, rx): (Sender<ResponseUpdate>, Receiver<ResponseUpdate>) = mpsc::channel();
 
         // Take ownership of grpc_client temporarily
         let mut client = AgentClient::new("127.0.0.1:50051");
@@ -192,23 +217,37 @@ impl ChatState {
             // Create runtime for this thread
             let runtime = Runtime::new().unwrap();
 
-            let result = runtime.block_on(async {
-                client.send_message(user_input, vec![]).await
-            });
-
-            let response = match result {
-                Ok(resp) => Ok((resp.message, resp.agent)),
-                Err(e) => Ok((format!(
-                    "⚠️ Service IA non disponible\n\n\
-                     Erreur: {}\n\n\
-                     💡 Assurez-vous que le service Python est démarré:\n\
-                     cd python && python agent_service.py",
-                    e
-                ), "error".to_string())),
-            };
+            runtime.block_on(async {
+                let mut stream = match client.stream_message(user_input, vec![]).await {
+                    Ok(stream) => stream,
+                    Err(e) => {
+                        tx.send(ResponseUpdate::Failed(format!(
+                            "⚠️ Service IA non disponible\n\n\
+                             Erreur: {}\n\n\
+                             💡 Assurez-vous que le service Python est démarré:\n\
+                             cd python && python agent_service.py",
+                            e
+                        ))).ok();
+                        return;
+                    }
+                };
 
-            // Send result back
-            tx.send(response).ok();
+                // Forward chunks as they arrive, stopping on the empty terminal message
+                loop {
+                    let update = match stream.message().await {
+                        Ok(Some(resp)) if resp.message.is_empty() => ResponseUpdate::Done,
+                        Ok(Some(resp)) => ResponseUpdate::Chunk(resp.message, resp.agent),
+                        Ok(None) => ResponseUpdate::Failed("⚠️ Réponse interrompue par le service IA".to_string()),
+                        Err(status) => ResponseUpdate::Failed(format!("⚠️ Erreur du service IA: {}", status.message())),
+                    };
+
+                    let finished = !matches!(update, ResponseUpdate::Chunk(..));
+                    // Stop if the chat window is gone
+                    if tx.send(update).is_err() || finished {
+                        break;
+                    }
+                }
+            });
         });
 
         // Store receiver
@@ -218,24 +257,43 @@ impl ChatState {
         self.add_loading_message();
     }
 
-    /// Check if response is ready and update message
+    /// Apply the streamed updates received so far
     pub fn check_response(&mut self) -> bool {
-        if let Some(ref receiver) = self.response_receiver {
-            if let Ok(result) = receiver.try_recv() {
-                // Response received!
-                match result {
-                    Ok((content, agent)) => {
-                        self.update_last_message(content, Some(agent));
+        let mut updated = false;
+
+        while let Some(ref receiver) = self.response_receiver {
+            let update = match receiver.try_recv() {
+                Ok(update) => update,
+                Err(TryRecvError::Empty) => break,
+                // The gRPC thread exited without a terminal update
+                Err(TryRecvError::Disconnected) => ResponseUpdate::Failed("❌ Error: response thread stopped".to_string()),
+            };
+            updated = true;
+
+            match update {
+                ResponseUpdate::Chunk(chunk, agent) => {
+                    self.append_to_last_message(&chunk, Some(agent));
+                    continue;
+                }
+                ResponseUpdate::Failed(error) => {
+                    // Keep what was already streamed and show the error below it
+                    if self.last_message_loading() {
+                        self.update_last_message(error, Some("error".to_string()));
+                    } else {
+                        self.append_to_last_message(&format!("\n\n{}", error), Some("error".to_string()));
                     }
-                    Err(e) => {
-                        self.update_last_message(format!("❌ Error: {}", e), Some("error".to_string()));
+                }
+                ResponseUpdate::Done => {
+                    // An empty response never left the loading state
+                    if self.last_message_loading() {
+                        self.update_last_message(String::new(), None);
                     }
                 }
-                self.response_receiver = None;
-                return true;
             }
+            self.response_receiver = None;
         }
-        false
+
+        updated
     }
 
     /// Update spinner animation
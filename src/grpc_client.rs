@@ -9,6 +9,7 @@ pub mod chat {
 
 use chat::chat_service_client::ChatServiceClient;
 use chat::{ChatRequest, ChatResponse};
+use tonic::codec::Streaming;
 
 /// gRPC client for communicating with Python agent service
 pub struct AgentClient {
@@ -113,6 +114,80 @@ impl AgentClient {
         Err(final_error)
     }
 
+    /// Open a streaming chat request and get the response chunks with automatic retry
+    ///
+    /// Only opening the stream is retried: once chunks have been handed out a
+    /// retry would replay them. Every chunk carries the agent and the stream
+    /// ends with an empty message, see python/proto/chat.proto.
+    pub async fn stream_message(
+        &mut self,
+        message: String,
+        context: Vec<String>,
+    ) -> Result<Streaming<ChatResponse>> {
+        let mut last_error = None;
+
+        // Retry loop with exponential backoff
+        for attempt in 0..=self.max_retries {
+            // Ensure we're connected (will reconnect if needed)
+            if self.client.is_none() {
+                debug!("Not connected, attempting to connect (attempt {})", attempt + 1);
+                match self.connect().await {
+                    Ok(_) => {},
+                    Err(e) => {
+                        warn!("Connection attempt {} failed: {}", attempt + 1, e);
+                        last_error = Some(e);
+                        if attempt < self.max_retries {
+                            // Exponential backoff: 1s, 2s, 4s
+                            let backoff = Duration::from_secs(2u64.pow(attempt));
+                            debug!("Retrying in {:?}", backoff);
+                            tokio::time::sleep(backoff).await;
+                            continue;
+                        }
+                        break;
+                    }
+                }
+            }
+
+            let mut request = tonic::Request::new(ChatRequest {
+                message: message.clone(),
+                context: context.clone(),
+            });
+
+            // Same deadline as send_message, covering the whole stream
+            request.set_timeout(Duration::from_secs(45));
+
+            match self
+                .client
+                .as_mut()
+                .ok_or_else(|| anyhow::anyhow!("Not connected"))?
+                .stream_message(request)
+                .await
+            {
+                Ok(response) => {
+                    debug!("Successfully opened response stream from gRPC service");
+                    return Ok(response.into_inner());
+                }
+                Err(e) => {
+                    // Connection lost, reset client for reconnection
+                    error!("gRPC stream request failed (attempt {}): {}", attempt + 1, e);
+                    self.client = None;
+                    last_error = Some(e.into());
+
+                    if attempt < self.max_retries {
+                        // Exponential backoff before retry
+                        let backoff = Duration::from_secs(2u64.pow(attempt));
+                        debug!("Retrying in {:?}", backoff);
+                        tokio::time::sleep(backoff).await;
+                    }
+                }
+            }
+        }
+
+        let final_error = last_error.unwrap_or_else(|| anyhow::anyhow!("Failed to open stream after retries"));
+        error!("All retry attempts exhausted: {}", final_error);
+        Err(final_error)
+    }
+
     /// Check if connected to service
     pub fn is_connected(&self) -> bool {
         self.client.is_some()